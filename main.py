@@ -3,8 +3,10 @@ from fastapi.middleware.cors import CORSMiddleware
 from fastapi.middleware.trustedhost import TrustedHostMiddleware
 from sqlalchemy.orm import Session
 from src.models.models import Base, engine, SessionLocal, Job, get_db
-from src.core.scheduler import SimpleScheduler as JobScheduler
+from src.core.scheduler import SimpleScheduler as JobScheduler, RemoteScheduler
 from src.core.settings import settings
+from src.core.events import event_broker
+from src.core.forecast import warm_schedule_cache
 import time
 import logging
 
@@ -46,7 +48,9 @@ app.add_middleware(
 )
 
 # Initialize components
-job_scheduler = JobScheduler()
+# In api mode jobs run in a separate `python -m src.core.scheduler` process
+api_only = settings.scheduler_mode == "api"
+job_scheduler = RemoteScheduler() if api_only else JobScheduler()
 
 # Make scheduler available to other modules
 def get_scheduler():
@@ -69,17 +73,17 @@ async def add_process_time_header(request: Request, call_next):
 # Load jobs on startup
 @app.on_event("startup")
 async def load_jobs_on_startup():
-    try:
-        db = SessionLocal()
-        jobs = db.query(Job).all()
-        for job in jobs:
-            job_scheduler.schedule_job(job.id, job.name, job.interval)
-        logger.info(f"Loaded and scheduled {len(jobs)} jobs from database")
-        db.close()
-    except Exception as e:
-        logger.error(f"Startup error loading jobs: {e}")
+    if api_only:
+        logger.info("API-only mode: jobs are run by the scheduler process")
+    else:
+        try:
+            logger.info(f"Loaded and scheduled {job_scheduler.sync_jobs()} jobs from database")
+        except Exception as e:
+            logger.error(f"Startup error loading jobs: {e}")
+    warm_schedule_cache()
 
 @app.on_event("shutdown")
 async def shutdown_event():
     logger.info("Shutting down application...")
     job_scheduler.shutdown()
+    event_broker.shutdown()
@@ -1,11 +1,17 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from src.models.models import Job, get_db
-from datetime import datetime
+from datetime import datetime, timedelta
 from typing import List, Optional, Dict
 from pydantic import BaseModel, validator
 from src.cache.redis_manager import redis_manager
+from src.core.events import event_broker, format_sse
+from src.core.forecast import load_schedule, scheduler_now, next_fire_times_iso, fires_histogram
+from src.core.scheduler import interval_seconds
+from src.core.settings import settings
 from enum import Enum
+import asyncio
 import logging
 import re
 
@@ -88,7 +94,8 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
         name=job.name,
         description=job.description,
         interval=job.interval,
-        next_run=datetime.now(),
+        # The interval trigger first fires one interval after it is added
+        next_run=datetime.now() + timedelta(seconds=interval_seconds(job.interval)),
         status=job.status
     )
     db.add(db_job)
@@ -98,8 +105,14 @@ def create_job(job: JobCreate, db: Session = Depends(get_db)):
     # Schedule the job with the scheduler
     if _scheduler:
         _scheduler.schedule_job(db_job.id, db_job.name, db_job.interval)
+        # Pick up the trigger's real next_run written back by the scheduler
+        db.refresh(db_job)
         logger.info(f"Created and scheduled reminder: {db_job.name} ({db_job.interval})")
     
+    event_broker.publish(
+        "create", db_job.id, name=db_job.name, status=db_job.status,
+        interval=db_job.interval, next_run=db_job.next_run
+    )
     return db_job
 
 @router.get("/jobs/{job_id}", response_model=JobResponse)
@@ -117,6 +130,7 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
         raise HTTPException(status_code=404, detail="Job not found")
     
     job_name = job.name
+    job_status = job.status
     db.delete(job)
     db.commit()
     
@@ -125,9 +139,92 @@ def delete_job(job_id: int, db: Session = Depends(get_db)):
         _scheduler.remove_job(job_id)
     
     logger.info(f"Deleted reminder: {job_name}")
+    event_broker.publish("delete", job_id, name=job_name, status=job_status)
     return {"message": "Job deleted"}
 
 
+@router.get("/events")
+async def stream_events(
+    request: Request,
+    job_ids: Optional[List[int]] = Query(None),
+    status: Optional[JobStatus] = None
+):
+    """Stream job fire/create/delete events as server-sent events"""
+    subscriber = event_broker.subscribe(
+        asyncio.get_running_loop(),
+        job_ids=job_ids,
+        status=status.value if status else None
+    )
+
+    async def event_stream():
+        try:
+            while not await request.is_disconnected():
+                try:
+                    event = await asyncio.wait_for(
+                        subscriber.queue.get(), timeout=settings.event_keepalive_seconds
+                    )
+                except asyncio.TimeoutError:
+                    yield ": keepalive\n\n"
+                    continue
+                if event is None:
+                    # Subscriber fell too far behind and was dropped
+                    break
+                yield format_sse(event)
+        finally:
+            event_broker.unsubscribe(subscriber)
+
+    return StreamingResponse(
+        event_stream(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
+
+@router.get("/forecast")
+def get_forecast(
+    count: int = Query(5, ge=1, le=100),
+    job_ids: Optional[List[int]] = Query(None),
+    limit: int = Query(1000, ge=1, le=10000),
+    offset: int = Query(0, ge=0),
+    db: Session = Depends(get_db)
+):
+    """
+    Next `count` fire times per job, in the scheduler's timezone
+    Paginated by job id; use /forecast/histogram for an all-jobs view
+    """
+    ids, next_run, interval_seconds = load_schedule(db, job_ids)
+    page = slice(offset, offset + limit)
+    now = scheduler_now()
+    fire_times = next_fire_times_iso(next_run[page], interval_seconds[page], now, count)
+    return {
+        "timezone": settings.scheduler_timezone,
+        "generated_at": str(now),
+        "total": len(ids),
+        "jobs": [
+            {"job_id": job_id, "fire_times": times}
+            for job_id, times in zip(ids[page].tolist(), fire_times)
+        ]
+    }
+
+
+@router.get("/forecast/histogram")
+def get_forecast_histogram(
+    hours: int = Query(24, ge=1, le=168),
+    bucket_minutes: int = Query(1, ge=1, le=1440),
+    db: Session = Depends(get_db)
+):
+    """Number of job fires per time bucket over the next `hours`"""
+    _, next_run, interval_seconds = load_schedule(db)
+    now = scheduler_now()
+    counts = fires_histogram(next_run, interval_seconds, now, hours * 3600, bucket_minutes * 60)
+    return {
+        "timezone": settings.scheduler_timezone,
+        "start": str(now),
+        "bucket_seconds": bucket_minutes * 60,
+        "counts": counts.tolist()
+    }
+
+
 @router.get("/redis/stats")
 def get_redis_stats():
     """Get Redis server statistics"""
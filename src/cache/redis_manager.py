@@ -4,17 +4,65 @@ Simple Redis manager for job scheduling
 from redis import Redis
 import logging
 import json
+import threading
+import time
 from datetime import datetime
 from src.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Longest wait between Redis reconnect attempts, in seconds
+MAX_BACKOFF_SECONDS = 60
+
+
+class RedisBackoff:
+    """Exponential reconnect backoff for a Redis connection, logging once per outage"""
+
+    def __init__(self, log: logging.Logger, unavailable: str, reconnected: str,
+                 max_seconds: float = MAX_BACKOFF_SECONDS):
+        self.log = log
+        self.unavailable = unavailable
+        self.reconnected = reconnected
+        self.max_seconds = max_seconds
+        self.delay = 0.0
+        self.retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def ready(self) -> bool:
+        """Whether the backoff has expired and Redis may be tried again"""
+        return time.monotonic() >= self.retry_at
+
+    def failed(self, error: Exception) -> float:
+        """Double the backoff after a failure and return the new delay"""
+        with self._lock:
+            if not self.delay:
+                self.log.warning(f"{self.unavailable}: {error}")
+            self.delay = min(max(self.delay * 2, 1.0), self.max_seconds)
+            self.retry_at = time.monotonic() + self.delay
+            return self.delay
+
+    def succeeded(self) -> bool:
+        """Clear the backoff once Redis answers again; True if it was down"""
+        if not self.delay:
+            return False
+        with self._lock:
+            recovered = bool(self.delay)
+            if recovered:
+                self.log.info(self.reconnected)
+            self.delay = 0.0
+            self.retry_at = 0.0
+            return recovered
+
+
 class RedisManager:
     def __init__(self):
         self.redis = Redis(
-            host="localhost",  # Simplified for local development
-            port=6379,
-            db=0,
+            host=settings.redis_host,
+            port=settings.redis_port,
+            password=settings.redis_password,
+            db=settings.redis_db,
+            socket_connect_timeout=settings.redis_socket_timeout,
+            socket_timeout=settings.redis_socket_timeout,
             decode_responses=True
         )
         
@@ -0,0 +1,183 @@
+"""
+Job event broker
+Fans out job fire/create/delete events to SSE subscribers, in-process and
+across replicas through Redis pub/sub
+"""
+from datetime import datetime
+from typing import Any, Callable, Dict, Iterable, List, Optional, Set
+import asyncio
+import json
+import logging
+import threading
+import time
+from src.cache.redis_manager import RedisBackoff, redis_manager
+from src.core.settings import settings
+
+logger = logging.getLogger(__name__)
+
+
+class EventSubscriber:
+    """A single SSE client with a bounded event buffer"""
+
+    def __init__(self, loop: asyncio.AbstractEventLoop, job_ids: Optional[Iterable[int]] = None,
+                 status: Optional[str] = None, max_buffer: int = 100):
+        self.loop = loop
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_buffer)
+        self.job_ids: Optional[Set[int]] = set(job_ids) if job_ids else None
+        self.status = status
+        self.dropped = False
+
+    def matches(self, event: Dict[str, Any]) -> bool:
+        """Check whether an event passes this subscriber's filters"""
+        if self.job_ids is not None and event.get("job_id") not in self.job_ids:
+            return False
+        if self.status is not None and event.get("status") != self.status:
+            return False
+        return True
+
+    def offer(self, event: Dict[str, Any]):
+        """Queue an event; runs on the subscriber's event loop"""
+        if self.dropped:
+            return
+        try:
+            self.queue.put_nowait(event)
+        except asyncio.QueueFull:
+            # Slow consumer: discard its backlog and tell the stream to close
+            self.dropped = True
+            while not self.queue.empty():
+                self.queue.get_nowait()
+            self.queue.put_nowait(None)
+            logger.warning("Dropped slow event subscriber")
+
+
+class EventBroker:
+    def __init__(self, redis_client=None, channel: str = settings.events_channel):
+        """Initialize the broker; without a Redis client events stay in-process"""
+        self._redis = redis_client
+        self._channel = channel
+        self._subscribers: Set[EventSubscriber] = set()
+        self._handlers: List[Callable[[Dict[str, Any]], None]] = []
+        self._lock = threading.Lock()
+        self._listener: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self._subscribed = threading.Event()
+        self._backoff = RedisBackoff(logger, "Redis unavailable, delivering events in-process only",
+                                     "Redis event channel reconnected")
+
+    def subscribe(self, loop: asyncio.AbstractEventLoop, job_ids: Optional[Iterable[int]] = None,
+                  status: Optional[str] = None) -> EventSubscriber:
+        """Register a subscriber that receives events on the given loop"""
+        subscriber = EventSubscriber(loop, job_ids, status, settings.event_buffer_size)
+        with self._lock:
+            self._subscribers.add(subscriber)
+        self._ensure_listener()
+        return subscriber
+
+    def add_handler(self, handler: Callable[[Dict[str, Any]], None]):
+        """Call handler with every event delivered to this process, from any replica"""
+        with self._lock:
+            self._handlers.append(handler)
+        self._ensure_listener()
+
+    def unsubscribe(self, subscriber: EventSubscriber):
+        """Remove a subscriber"""
+        with self._lock:
+            self._subscribers.discard(subscriber)
+
+    def publish(self, event_type: str, job_id: int, **fields):
+        """
+        Publish a job event to every replica through Redis
+        Local subscribers are served directly whenever the pub/sub listener is
+        not subscribed (Redis down, startup, reconnecting), since Redis does not
+        buffer messages for a channel nobody here is listening on yet.
+        """
+        status = fields.pop("status", None)
+        event = {
+            "type": event_type,
+            "job_id": job_id,
+            "status": getattr(status, "value", status),
+            "timestamp": datetime.now().isoformat(),
+            **fields,
+        }
+        if self._redis_ready():
+            try:
+                self._redis.publish(self._channel, json.dumps(event, default=str))
+                self._backoff.succeeded()
+                if self._subscribed.is_set():
+                    # The pub/sub listener delivers it back to local subscribers
+                    return
+            except Exception as e:
+                self._backoff.failed(e)
+        self._dispatch(event)
+
+    def _redis_ready(self) -> bool:
+        """Whether Redis is configured and not inside a reconnect backoff"""
+        return self._redis is not None and self._backoff.ready()
+
+    def _dispatch(self, event: Dict[str, Any]):
+        """Hand an event to every matching local subscriber"""
+        with self._lock:
+            handlers = list(self._handlers)
+            subscribers = [s for s in self._subscribers if not s.dropped and s.matches(event)]
+        for handler in handlers:
+            try:
+                handler(event)
+            except Exception as e:
+                logger.error(f"Event handler error: {e}")
+        for subscriber in subscribers:
+            try:
+                subscriber.loop.call_soon_threadsafe(subscriber.offer, event)
+            except RuntimeError:
+                # Event loop already closed
+                self.unsubscribe(subscriber)
+
+    def _ensure_listener(self):
+        """Start the Redis pub/sub listener thread once"""
+        if self._redis is None:
+            return
+        with self._lock:
+            if self._listener is not None and self._listener.is_alive():
+                return
+            self._stop.clear()
+            self._listener = threading.Thread(target=self._listen, name="job-events", daemon=True)
+            self._listener.start()
+
+    def _listen(self):
+        """Relay events from Redis pub/sub to local subscribers"""
+        while not self._stop.is_set():
+            if not self._redis_ready():
+                self._stop.wait(max(self._backoff.retry_at - time.monotonic(), 0.1))
+                continue
+            pubsub = None
+            try:
+                pubsub = self._redis.pubsub(ignore_subscribe_messages=True)
+                pubsub.subscribe(self._channel)
+                self._subscribed.set()
+                self._backoff.succeeded()
+                while not self._stop.is_set():
+                    message = pubsub.get_message(timeout=1.0)
+                    if message and message.get("type") == "message":
+                        self._dispatch(json.loads(message["data"]))
+            except Exception as e:
+                self._subscribed.clear()
+                self._backoff.failed(e)
+            finally:
+                self._subscribed.clear()
+                if pubsub is not None:
+                    try:
+                        pubsub.close()
+                    except Exception:
+                        pass
+
+    def shutdown(self):
+        """Stop the listener thread"""
+        self._stop.set()
+
+
+def format_sse(event: Dict[str, Any]) -> str:
+    """Serialize an event as a server-sent event frame"""
+    return f"event: {event['type']}\ndata: {json.dumps(event, default=str)}\n\n"
+
+
+# Global event broker instance
+event_broker = EventBroker(redis_manager.redis)
@@ -0,0 +1,243 @@
+"""
+Upcoming-schedule forecast
+Computes next fire times and fires-per-bucket histograms for all jobs
+with vectorized NumPy arithmetic
+"""
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+from zoneinfo import ZoneInfo
+import logging
+import threading
+import time
+import numpy as np
+from sqlalchemy import String, cast, select
+from sqlalchemy.orm import Session
+from src.core.events import event_broker
+from src.core.scheduler import interval_seconds
+from src.core.settings import settings
+from src.models.models import Job, SessionLocal
+
+logger = logging.getLogger(__name__)
+
+# Schedule arrays shared across requests, see load_schedule
+_schedule_cache: Dict[str, Any] = {}
+_cache_lock = threading.Lock()
+_load_lock = threading.Lock()
+
+
+def scheduler_now(timezone: str = settings.scheduler_timezone) -> np.datetime64:
+    """Current wall-clock time in the scheduler's timezone"""
+    now = datetime.now(ZoneInfo(timezone)).replace(tzinfo=None)
+    return np.datetime64(now, 's')
+
+
+def _local_to_scheduler_offset(timezone: str) -> np.timedelta64:
+    """
+    Offset from the server's local wall clock to the scheduler's.
+    next_run is stored as naive local time (datetime.now()), so this shifts
+    it onto the scheduler's clock. Taken at the current instant, so a DST
+    change inside the forecast window is not accounted for.
+    """
+    scheduler = datetime.now(ZoneInfo(timezone))
+    local = scheduler.astimezone()
+    delta = scheduler.replace(tzinfo=None) - local.replace(tzinfo=None)
+    return np.timedelta64(int(delta.total_seconds()), 's')
+
+
+def _fetch_schedule(db: Session) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Read id, next_run (server-local) and interval seconds for every job into typed arrays"""
+    query = select(Job.id, cast(Job.next_run, String), Job.interval).order_by(Job.id)
+    # Raw DBAPI tuples from CursorResult.cursor skip SQLAlchemy's per-row
+    # Row construction, about half the load time at a million rows. Checked on
+    # SQLite (pysqlite), where next_run comes back as 'YYYY-MM-DD HH:MM:SS.ffffff';
+    # PostgreSQL's text cast of a timestamp uses the same format.
+    rows = db.connection().execute(query).cursor.fetchall()
+    count = len(rows)
+    ids = np.fromiter((row[0] for row in rows), dtype=np.int64, count=count)
+    # ISO strings parse in one vectorized call; fractional seconds are dropped
+    next_run = np.array([row[1][:19] for row in rows], dtype='datetime64[s]')
+
+    # Parse each distinct interval string once and broadcast back to all jobs
+    codes: Dict[str, int] = {}
+    inverse = np.fromiter((codes.setdefault(row[2], len(codes)) for row in rows),
+                          dtype=np.int64, count=count)
+    unique_seconds = np.array([interval_seconds(i) for i in codes], dtype=np.int64)
+    return ids, next_run, unique_seconds[inverse]
+
+
+def _apply_event(event: Dict[str, Any]):
+    """Keep the cached arrays current from a job event, on any replica"""
+    if event["type"] not in ("create", "delete", "fire"):
+        return
+    with _cache_lock:
+        if "pending" in _schedule_cache:
+            # A reload is reading the database; replay once it lands
+            _schedule_cache["pending"].append(event)
+        if "arrays" in _schedule_cache:
+            _schedule_cache["arrays"] = _patch(_schedule_cache["arrays"], event)
+
+
+def _patch(arrays: Tuple[np.ndarray, np.ndarray, np.ndarray],
+           event: Dict[str, Any]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Apply one job event to (ids, next_run, interval_seconds), kept sorted by id"""
+    ids, next_run, intervals = arrays
+    job_id = event["job_id"]
+    position = int(np.searchsorted(ids, job_id))
+    present = position < len(ids) and ids[position] == job_id
+    run_at = np.datetime64(str(event.get("next_run"))[:19], 's') if event.get("next_run") else None
+
+    if event["type"] == "fire":
+        if present and run_at is not None:
+            # Single element write; readers only ever derive new arrays
+            next_run[position] = run_at
+        return arrays
+    if present:
+        ids, next_run, intervals = (np.delete(a, position) for a in (ids, next_run, intervals))
+    if event["type"] == "create" and run_at is not None:
+        ids = np.insert(ids, position, job_id)
+        next_run = np.insert(next_run, position, run_at)
+        intervals = np.insert(intervals, position, interval_seconds(event["interval"]))
+    return ids, next_run, intervals
+
+
+def _reload(db: Session, force: bool = True):
+    """Replace the cached arrays with a fresh database read"""
+    with _load_lock:
+        if not force and "arrays" in _schedule_cache:
+            # Another request or the startup warm-up loaded them meanwhile
+            return
+        with _cache_lock:
+            if not _schedule_cache.get("subscribed"):
+                # Subscribe before reading so no create/delete slips between the two
+                event_broker.add_handler(_apply_event)
+                _schedule_cache["subscribed"] = True
+            _schedule_cache["pending"] = []
+        try:
+            arrays = _fetch_schedule(db)
+        finally:
+            with _cache_lock:
+                pending = _schedule_cache.pop("pending")
+        with _cache_lock:
+            for event in pending:
+                arrays = _patch(arrays, event)
+            _schedule_cache.update(arrays=arrays, loaded_at=time.monotonic())
+
+
+def _reload_in_background():
+    try:
+        with SessionLocal() as db:
+            _reload(db)
+    except Exception as e:
+        logger.error(f"Forecast schedule reload failed: {e}")
+    finally:
+        with _cache_lock:
+            _schedule_cache.pop("refreshing", None)
+
+
+def warm_schedule_cache():
+    """Load the schedule arrays ahead of the first forecast request"""
+    threading.Thread(target=_reload_in_background, name="forecast-warm", daemon=True).start()
+
+
+def invalidate_schedule_cache():
+    """Drop the cached schedule arrays so the next load reads the database"""
+    with _cache_lock:
+        _schedule_cache.pop("arrays", None)
+        _schedule_cache.pop("loaded_at", None)
+
+
+def load_schedule(db: Session, job_ids: Optional[List[int]] = None,
+                  timezone: str = settings.scheduler_timezone
+                  ) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """
+    Load every job's schedule as arrays
+    The arrays are read from the database once, then patched in place by
+    create/delete/fire events from every replica, so requests never pay for
+    the read. A full reload still runs in the background every
+    settings.forecast_refresh_seconds to pick up changes made outside the API.
+    Returns:
+        (job ids, next_run as datetime64[s] in the scheduler's timezone,
+        interval in seconds as int64)
+    """
+    with _cache_lock:
+        cached = _schedule_cache.get("arrays")
+        expired = (cached is not None and not _schedule_cache.get("refreshing")
+                   and time.monotonic() - _schedule_cache["loaded_at"] > settings.forecast_refresh_seconds)
+        if expired:
+            _schedule_cache["refreshing"] = True
+    if expired:
+        threading.Thread(target=_reload_in_background, name="forecast-refresh", daemon=True).start()
+    if cached is None:
+        _reload(db, force=False)
+        with _cache_lock:
+            cached = _schedule_cache["arrays"]
+
+    ids, next_run, intervals = cached
+    if job_ids:
+        mask = np.isin(ids, job_ids)
+        ids, next_run, intervals = ids[mask], next_run[mask], intervals[mask]
+    return ids, next_run + _local_to_scheduler_offset(timezone), intervals
+
+
+def first_fire_offsets(next_run: np.ndarray, interval_seconds: np.ndarray,
+                       now: np.datetime64) -> np.ndarray:
+    """Seconds from now until each job's next fire, rolling stale next_run values forward"""
+    offsets = (next_run - now).astype(np.int64)
+    # A next_run in the past fires again at the first interval boundary >= now
+    return np.where(offsets < 0, np.mod(offsets, interval_seconds), offsets)
+
+
+def next_fire_times(next_run: np.ndarray, interval_seconds: np.ndarray,
+                    now: np.datetime64, count: int) -> np.ndarray:
+    """Next `count` fire times for each job, shape (n_jobs, count)"""
+    first = now + first_fire_offsets(next_run, interval_seconds, now).astype('timedelta64[s]')
+    steps = np.arange(count, dtype=np.int64)
+    return first[:, None] + (interval_seconds[:, None] * steps).astype('timedelta64[s]')
+
+
+def next_fire_times_iso(next_run: np.ndarray, interval_seconds: np.ndarray,
+                        now: np.datetime64, count: int) -> List[List[str]]:
+    """next_fire_times formatted as ISO 8601 strings per job"""
+    times = next_fire_times(next_run, interval_seconds, now, count)
+    return np.datetime_as_string(times, unit='s').tolist()
+
+
+def fires_histogram(next_run: np.ndarray, interval_seconds: np.ndarray, now: np.datetime64,
+                    horizon_seconds: int = 86400, bucket_seconds: int = 60) -> np.ndarray:
+    """
+    Number of fires per bucket over [now, now + horizon)
+    Interval groups with at least as many fires as the horizon has seconds
+    are binned by first fire second and carried forward with a strided
+    cumulative sum, costing O(horizon) each. Sparser groups, such as the long
+    tail of rarely used "N minutes" values, have their individual fires
+    expanded instead, so the total work is bounded by the number of fires.
+    """
+    buckets = -(-horizon_seconds // bucket_seconds)
+    offsets = first_fire_offsets(next_run, interval_seconds, now)
+    inside = offsets < horizon_seconds
+    offsets, interval_seconds = offsets[inside], interval_seconds[inside]
+    if not len(offsets):
+        return np.zeros(buckets, dtype=np.int64)
+
+    fires = (horizon_seconds - 1 - offsets) // interval_seconds + 1
+    intervals, inverse = np.unique(interval_seconds, return_inverse=True)
+    dense = np.bincount(inverse, weights=fires) >= horizon_seconds
+
+    # Sparse groups: one entry per fire
+    sparse = ~dense[inverse]
+    sparse_fires = fires[sparse]
+    job = np.repeat(np.arange(len(sparse_fires)), sparse_fires)
+    step = np.arange(len(job)) - np.repeat(np.cumsum(sparse_fires) - sparse_fires, sparse_fires)
+    times = offsets[sparse][job] + step * interval_seconds[sparse][job]
+    counts = np.bincount(times // bucket_seconds, minlength=buckets)
+
+    # Dense groups: strided cumulative sum over per-second first fires
+    per_second = np.zeros(buckets * bucket_seconds, dtype=np.int64)
+    order = np.argsort(inverse[~sparse], kind='stable')
+    dense_groups, starts = np.unique(inverse[~sparse][order], return_index=True)
+    for group, group_offsets in zip(dense_groups, np.split(offsets[~sparse][order], starts[1:])):
+        interval = intervals[group]
+        periods = -(-horizon_seconds // interval)
+        first = np.bincount(group_offsets, minlength=periods * interval)
+        per_second[:horizon_seconds] += first.reshape(periods, interval).cumsum(axis=0).ravel()[:horizon_seconds]
+    return counts + per_second.reshape(buckets, bucket_seconds).sum(axis=1)
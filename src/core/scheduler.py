@@ -1,22 +1,65 @@
 """
 Job scheduler using APScheduler
 Handles scheduling and executing jobs at specified intervals
+
+Run `python -m src.core.scheduler` to start a dedicated scheduler process
+that takes commands from API processes running with SCHEDULER_MODE=api
 """
 from datetime import datetime, timedelta
+from typing import Dict, Optional
 from apscheduler.schedulers.background import BackgroundScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from apscheduler.triggers.date import DateTrigger
 import re
+import json
 import logging
+import signal
+import threading
+import time
+from sqlalchemy import bindparam, update
 from src.models.models import SessionLocal, Job
+from src.cache.redis_manager import RedisBackoff, redis_manager
+from src.core.events import event_broker
+from src.core.settings import settings
 
 logger = logging.getLogger(__name__)
 
+# Jobs never fire more often than this
+MIN_INTERVAL_SECONDS = 60
+
+def parse_interval(interval: str) -> timedelta:
+    """Convert interval string to timedelta"""
+    interval = interval.lower().strip()
+    try:
+        # Match minute intervals (e.g., "5 minutes")
+        if match := re.match(r"^(\d+)\s*(?:m|min|mins|minutes?)$", interval):
+            return timedelta(minutes=int(match.group(1)))
+             
+        # Match hour intervals (e.g., "2 hours")
+        if match := re.match(r"^(\d+)\s*(?:h|hr|hrs|hours?)$", interval):
+            return timedelta(hours=int(match.group(1)))
+            
+        # Handle daily/weekly
+        if interval == "daily":
+            return timedelta(days=1)
+        if interval == "weekly":
+            return timedelta(weeks=1)
+            
+        raise ValueError(f"Can't understand interval: {interval}")
+    except Exception:
+        # Default to 1 hour if interval format is invalid
+        logger.warning(f"Invalid interval format: {interval}, defaulting to 1 hour")
+        return timedelta(hours=1)
+
+def interval_seconds(interval: str) -> int:
+    """Seconds between fires for an interval string, after the 1 minute minimum"""
+    return max(int(parse_interval(interval).total_seconds()), MIN_INTERVAL_SECONDS)
+
 class SimpleScheduler:
     def __init__(self):
         """Initialize the scheduler"""
         self.scheduler = BackgroundScheduler(
-            timezone='Asia/Kolkata',  # Set default timezone
+            timezone=settings.scheduler_timezone,  # Set default timezone
             job_defaults={
                 'coalesce': True,  # Combine missed executions into a single one
                 'max_instances': 1,  # Only one instance of each job can run at a time
@@ -28,38 +71,23 @@ class SimpleScheduler:
     
     def _parse_interval(self, interval: str) -> timedelta:
         """Convert interval string to timedelta"""
-        interval = interval.lower().strip()
-        try:
-            # Match minute intervals (e.g., "5 minutes")
-            if match := re.match(r"^(\d+)\s*(?:m|min|mins|minutes?)$", interval):
-                return timedelta(minutes=int(match.group(1)))
-                 
-            # Match hour intervals (e.g., "2 hours")
-            if match := re.match(r"^(\d+)\s*(?:h|hr|hrs|hours?)$", interval):
-                return timedelta(hours=int(match.group(1)))
-                
-            # Handle daily/weekly
-            if interval == "daily":
-                return timedelta(days=1)
-            if interval == "weekly":
-                return timedelta(weeks=1)
-                
-            raise ValueError(f"Can't understand interval: {interval}")
-        except Exception:
-            # Default to 1 hour if interval format is invalid
-            logger.warning(f"Invalid interval format: {interval}, defaulting to 1 hour")
-            return timedelta(hours=1)
+        return parse_interval(interval)
     
     def schedule_job(self, job_id: int, name: str, interval: str):
         """Schedule a reminder job"""
+        next_run_time = self._add_job(job_id, name, interval)
+        if next_run_time:
+            self._store_next_runs({job_id: next_run_time})
+    
+    def _add_job(self, job_id: int, name: str, interval: str) -> Optional[datetime]:
+        """Add or replace a job's trigger and return its first fire time"""
         try:
-            delta = self._parse_interval(interval)
-            seconds = int(delta.total_seconds())
+            seconds = int(self._parse_interval(interval).total_seconds())
             
             # For very frequent jobs (less than 1 minute), increase the interval
-            if seconds < 60:
+            if seconds < MIN_INTERVAL_SECONDS:
                 logger.warning(f"Interval too short for {name}, setting to 1 minute minimum")
-                seconds = 60
+                seconds = MIN_INTERVAL_SECONDS
             
             job_exists = False
             try:
@@ -82,8 +110,31 @@ class SimpleScheduler:
                 logger.debug(f"Scheduled job: {name} ({interval})")
             else:
                 logger.debug(f"Rescheduled job: {name} ({interval})")
+            return self.scheduler.get_job(str(job_id)).next_run_time
         except Exception as e:
             logger.error(f"Error scheduling job {name}: {e}")
+            return None
+    
+    def _store_next_runs(self, next_runs: Dict[int, datetime]):
+        """
+        Write triggers' real first fire times back to next_run
+        IntervalTrigger counts from when the job was added, not from the stored
+        next_run, so without this forecasts drift after every (re)schedule
+        """
+        if not next_runs:
+            return
+        jobs = Job.__table__
+        statement = update(jobs).where(jobs.c.id == bindparam("job_id")).values(next_run=bindparam("run_at"))
+        try:
+            with SessionLocal() as db:
+                # next_run holds naive server-local time, like datetime.now()
+                db.execute(statement, [
+                    {"job_id": job_id, "run_at": run_at.astimezone().replace(tzinfo=None)}
+                    for job_id, run_at in next_runs.items()
+                ])
+                db.commit()
+        except Exception as e:
+            logger.error(f"Could not store next run times: {e}")
     
     def _run_job(self, job_id: int):
         """Execute a scheduled job"""
@@ -96,6 +147,10 @@ class SimpleScheduler:
                     job.next_run = now + self._parse_interval(job.interval)
                     db.commit()
                     logger.info(f"Reminder: {job.name} at {now.strftime('%H:%M:%S')}")
+                    event_broker.publish(
+                        "fire", job.id, name=job.name, status=job.status,
+                        last_run=job.last_run, next_run=job.next_run
+                    )
                 
         except Exception as e:
             logger.error(f"Job execution error: {str(e)}")
@@ -110,4 +165,122 @@ class SimpleScheduler:
     
     def shutdown(self):
         """Shut down the scheduler gracefully"""
-        self.scheduler.shutdown()
\ No newline at end of file
+        self.scheduler.shutdown()
+    
+    def sync_jobs(self):
+        """
+        Match scheduled jobs to the database
+        Only missing jobs and jobs whose interval changed are (re)scheduled;
+        re-adding a job restarts its interval, so existing timers are left alone
+        """
+        with SessionLocal() as db:
+            jobs = db.query(Job.id, Job.name, Job.interval).all()
+        scheduled = {job.id: job for job in self.scheduler.get_jobs()}
+        next_runs = {}
+        for job_id, name, interval in jobs:
+            current = scheduled.pop(str(job_id), None)
+            if current is None or current.trigger.interval.total_seconds() != interval_seconds(interval):
+                next_run_time = self._add_job(job_id, name, interval)
+                if next_run_time:
+                    next_runs[job_id] = next_run_time
+        self._store_next_runs(next_runs)
+        for job_id in scheduled:
+            self.remove_job(int(job_id))
+        return len(jobs)
+
+
+class RemoteScheduler:
+    """
+    Scheduler stand-in for API-only processes
+    Forwards schedule/remove commands to the dedicated scheduler process
+    through a Redis list instead of running jobs in the web worker
+    """
+    def __init__(self, redis_client=None, queue: str = settings.scheduler_commands_key):
+        self.redis = redis_client if redis_client is not None else redis_manager.redis
+        self.queue = queue
+    
+    def _send(self, command: dict):
+        try:
+            self.redis.lpush(self.queue, json.dumps(command))
+        except Exception as e:
+            # The job row is already committed; the scheduler process's periodic resync picks it up
+            logger.error(f"Could not send scheduler command {command['action']}, "
+                         f"applying at next resync: {e}")
+    
+    def schedule_job(self, job_id: int, name: str, interval: str):
+        """Create or reschedule a job in the scheduler process"""
+        self._send({"action": "schedule", "job_id": job_id, "name": name, "interval": interval})
+    
+    def remove_job(self, job_id: int):
+        """Stop a job in the scheduler process"""
+        self._send({"action": "remove", "job_id": job_id})
+    
+    def shutdown(self):
+        """Nothing to stop; the scheduler process owns the jobs"""
+        pass
+
+
+def apply_command(scheduler: SimpleScheduler, command: dict):
+    """Apply one command sent by RemoteScheduler"""
+    if command["action"] == "schedule":
+        scheduler.schedule_job(command["job_id"], command["name"], command["interval"])
+    elif command["action"] == "remove":
+        scheduler.remove_job(command["job_id"])
+    else:
+        logger.warning(f"Unknown scheduler command: {command['action']}")
+
+
+def process_commands(scheduler: SimpleScheduler, redis, stop: threading.Event,
+                     queue: str = settings.scheduler_commands_key,
+                     sync_seconds: float = settings.scheduler_sync_seconds):
+    """
+    Apply commands from the Redis list until stopped
+    Commands are fire-and-forget, so one the API could not push is lost. The
+    database stays the source of truth: jobs are resynced after an outage and
+    every sync_seconds, which only touches jobs that were added, removed or
+    changed.
+    """
+    backoff = RedisBackoff(logger, "Scheduler command channel unavailable, retrying",
+                           "Scheduler command channel reconnected")
+    synced_at = time.monotonic()
+    while not stop.is_set():
+        try:
+            item = redis.brpop(queue, timeout=1)
+        except Exception as e:
+            stop.wait(backoff.failed(e))
+            continue
+        if backoff.succeeded() or time.monotonic() - synced_at >= sync_seconds:
+            synced_at = time.monotonic()
+            if changed := scheduler.sync_jobs():
+                logger.info(f"Resynced {changed} jobs from database")
+        if not item:
+            continue
+        try:
+            apply_command(scheduler, json.loads(item[1]))
+        except Exception as e:
+            logger.error(f"Bad scheduler command {item[1]!r}: {e}")
+
+
+def run_scheduler_process():
+    """Run only the scheduling engine, applying commands sent by API processes"""
+    scheduler = SimpleScheduler()
+    stop = threading.Event()
+    signal.signal(signal.SIGTERM, lambda *_: stop.set())
+    signal.signal(signal.SIGINT, lambda *_: stop.set())
+    
+    logger.info(f"Loaded and scheduled {scheduler.sync_jobs()} jobs from database")
+    try:
+        process_commands(scheduler, redis_manager.redis, stop)
+    finally:
+        logger.info("Shutting down scheduler process...")
+        scheduler.shutdown()
+        event_broker.shutdown()
+
+
+if __name__ == "__main__":
+    logging.basicConfig(
+        level=getattr(logging, settings.log_level.upper()),
+        format='%(asctime)s %(levelname)s: %(message)s',
+    )
+    logging.getLogger('apscheduler').setLevel(logging.WARNING)
+    run_scheduler_process()
@@ -1,13 +1,24 @@
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import List, Literal, Optional
 
 class Settings(BaseSettings):
     debug: bool = True
     log_level: str = "INFO"
     cors_origins: List[str] = ["*"]
     allowed_hosts: List[str] = ["*"]
-    redis_url: str = "redis://localhost:6379/0"
-    redis_password: str = "defaultpassword"  # Change this in production
+    database_url: str = "sqlite:///./jobs.db"
+    redis_host: str = "localhost"
+    redis_port: int = 6379
+    redis_password: Optional[str] = None  # Set when Redis runs with requirepass
     redis_db: int = 0
+    redis_socket_timeout: float = 2.0  # Bounds how long a fire or request waits on a hung Redis
+    scheduler_timezone: str = "Asia/Kolkata"
+    forecast_refresh_seconds: float = 300.0  # Background full reload; events keep it current in between
+    scheduler_mode: Literal["embedded", "api"] = "embedded"  # api: jobs run in a separate scheduler process
+    scheduler_commands_key: str = "jobs:scheduler:commands"
+    scheduler_sync_seconds: float = 60.0  # Scheduler process rereads jobs, covering commands lost in transit
+    events_channel: str = "jobs:events"
+    event_buffer_size: int = 100  # Per-subscriber buffer before a slow client is dropped
+    event_keepalive_seconds: float = 15.0
 
 settings = Settings()
\ No newline at end of file
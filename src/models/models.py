@@ -6,10 +6,12 @@ from sqlalchemy import Column, Integer, String, DateTime, create_engine
 from sqlalchemy.ext.declarative import declarative_base
 from sqlalchemy.orm import sessionmaker
 from datetime import datetime
+from src.core.settings import settings
 
-# Create database engine - using SQLite for simplicity
-DATABASE_URL = "sqlite:///./jobs.db"
-engine = create_engine(DATABASE_URL, connect_args={"check_same_thread": False})
+# Create database engine - SQLite by default, set DATABASE_URL for PostgreSQL
+DATABASE_URL = settings.database_url
+connect_args = {"check_same_thread": False} if DATABASE_URL.startswith("sqlite") else {}
+engine = create_engine(DATABASE_URL, connect_args=connect_args)
 
 # Create session factory
 SessionLocal = sessionmaker(bind=engine)
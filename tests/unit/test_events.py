@@ -0,0 +1,243 @@
+"""
+Unit tests for the job event broker
+"""
+from datetime import datetime
+import asyncio
+import logging
+import queue
+import pytest
+from src.api import api
+from src.core.events import EventBroker, EventSubscriber, format_sse
+from src.core.settings import settings
+
+
+class FailingRedis:
+    """Redis stand-in whose connection always fails"""
+    def __init__(self):
+        self.publish_calls = 0
+
+    def publish(self, channel, message):
+        self.publish_calls += 1
+        raise ConnectionError("Connection refused")
+
+
+def test_subscriber_matches_job_ids_and_status():
+    loop = asyncio.new_event_loop()
+    try:
+        any_event = EventSubscriber(loop)
+        by_job = EventSubscriber(loop, job_ids=[1, 2])
+        by_both = EventSubscriber(loop, job_ids=[1], status="active")
+
+        event = {"type": "fire", "job_id": 1, "status": "active"}
+        other_job = {"type": "fire", "job_id": 3, "status": "active"}
+        other_status = {"type": "fire", "job_id": 1, "status": "pending"}
+
+        assert any_event.matches(event) and any_event.matches(other_job)
+        assert by_job.matches(event) and not by_job.matches(other_job)
+        assert by_both.matches(event)
+        assert not by_both.matches(other_job)
+        assert not by_both.matches(other_status)
+    finally:
+        loop.close()
+
+
+def test_subscriber_dropped_when_buffer_overflows():
+    async def run():
+        subscriber = EventSubscriber(asyncio.get_running_loop(), max_buffer=2)
+        subscriber.offer({"job_id": 1})
+        subscriber.offer({"job_id": 2})
+        assert not subscriber.dropped
+        assert subscriber.queue.qsize() == 2
+
+        subscriber.offer({"job_id": 3})
+        assert subscriber.dropped
+        # Backlog is discarded and only the close sentinel remains
+        assert subscriber.queue.qsize() == 1
+        assert subscriber.queue.get_nowait() is None
+
+        subscriber.offer({"job_id": 4})
+        assert subscriber.queue.empty()
+
+    asyncio.run(run())
+
+
+def test_publish_without_redis_delivers_to_matching_subscribers():
+    async def run():
+        broker = EventBroker()
+        loop = asyncio.get_running_loop()
+        watching = broker.subscribe(loop, job_ids=[7])
+        other = broker.subscribe(loop, job_ids=[8])
+
+        broker.publish("fire", 7, status="active", name="backup")
+        await asyncio.sleep(0)
+
+        event = watching.queue.get_nowait()
+        assert event["type"] == "fire"
+        assert event["job_id"] == 7
+        assert event["status"] == "active"
+        assert event["name"] == "backup"
+        assert other.queue.empty()
+
+        broker.unsubscribe(watching)
+        broker.publish("fire", 7)
+        await asyncio.sleep(0)
+        assert watching.queue.empty()
+
+    asyncio.run(run())
+
+
+def test_publish_backs_off_while_redis_is_down(caplog):
+    async def run():
+        redis = FailingRedis()
+        broker = EventBroker(redis)
+        subscriber = EventSubscriber(asyncio.get_running_loop())
+        broker._subscribers.add(subscriber)
+
+        with caplog.at_level(logging.WARNING, logger="src.core.events"):
+            for job_id in range(5):
+                broker.publish("create", job_id)
+        await asyncio.sleep(0)
+
+        # One failed attempt, then publishing skips Redis until the backoff expires
+        assert redis.publish_calls == 1
+        assert len([r for r in caplog.records if "Redis unavailable" in r.message]) == 1
+        assert subscriber.queue.qsize() == 5
+
+        broker._backoff.retry_at = 0.0
+        broker.publish("create", 5)
+        assert redis.publish_calls == 2
+        assert broker._backoff.delay == 2.0
+        assert len([r for r in caplog.records if "Redis unavailable" in r.message]) == 1
+
+    asyncio.run(run())
+
+
+def test_format_sse():
+    frame = format_sse({"type": "delete", "job_id": 3})
+    assert frame == 'event: delete\ndata: {"type": "delete", "job_id": 3}\n\n'
+
+
+class FakePubSubRedis:
+    """In-memory Redis pub/sub: like Redis, drops messages nobody is subscribed to"""
+    def __init__(self):
+        self.published = []
+        self.messages = queue.Queue()
+        self.subscribers = 0
+
+    def publish(self, channel, message):
+        self.published.append((channel, message))
+        if self.subscribers:
+            self.messages.put(message)
+
+    def pubsub(self, ignore_subscribe_messages=False):
+        return FakePubSub(self)
+
+
+class FakePubSub:
+    def __init__(self, redis):
+        self.redis = redis
+
+    def subscribe(self, channel):
+        self.redis.subscribers += 1
+
+    def get_message(self, timeout=0.0):
+        try:
+            return {"type": "message", "data": self.redis.messages.get(timeout=timeout)}
+        except queue.Empty:
+            return None
+
+    def close(self):
+        self.redis.subscribers -= 1
+
+
+def test_redis_round_trip_through_listener():
+    async def run():
+        redis = FakePubSubRedis()
+        broker = EventBroker(redis, channel="events")
+        try:
+            subscriber = broker.subscribe(asyncio.get_running_loop())
+            assert await asyncio.to_thread(broker._subscribed.wait, 5)
+
+            broker.publish("fire", 4, status="active", next_run=datetime(2026, 10, 19, 10, 0))
+            event = await asyncio.wait_for(subscriber.queue.get(), timeout=5)
+            assert event["job_id"] == 4
+            assert event["next_run"] == "2026-10-19 10:00:00"
+            assert redis.published[0][0] == "events"
+
+            # Delivered once, by the listener only
+            await asyncio.sleep(0.05)
+            assert subscriber.queue.empty()
+        finally:
+            broker.shutdown()
+
+    asyncio.run(run())
+
+
+def test_publish_before_listener_subscribes_is_delivered_locally():
+    async def run():
+        redis = FakePubSubRedis()
+        broker = EventBroker(redis)
+        subscriber = EventSubscriber(asyncio.get_running_loop())
+        broker._subscribers.add(subscriber)
+
+        broker.publish("create", 9)
+        await asyncio.sleep(0)
+
+        assert len(redis.published) == 1
+        assert subscriber.queue.get_nowait()["job_id"] == 9
+
+    asyncio.run(run())
+
+
+class FakeRequest:
+    def __init__(self):
+        self.disconnected = False
+
+    async def is_disconnected(self):
+        return self.disconnected
+
+
+@pytest.fixture
+def local_broker(monkeypatch):
+    broker = EventBroker()
+    monkeypatch.setattr(api, "event_broker", broker)
+    monkeypatch.setattr(settings, "event_keepalive_seconds", 0.05)
+    return broker
+
+
+def test_event_stream_sends_keepalives_and_events(local_broker):
+    async def run():
+        request = FakeRequest()
+        response = await api.stream_events(request, job_ids=[1], status=None)
+        assert response.media_type == "text/event-stream"
+        body = response.body_iterator
+
+        assert await body.__anext__() == ": keepalive\n\n"
+        local_broker.publish("fire", 2)
+        local_broker.publish("fire", 1, status="active")
+        frame = await body.__anext__()
+        assert frame.startswith("event: fire\n")
+        assert '"job_id": 1' in frame
+
+        request.disconnected = True
+        with pytest.raises(StopAsyncIteration):
+            await body.__anext__()
+        assert not local_broker._subscribers
+
+    asyncio.run(run())
+
+
+def test_event_stream_closes_slow_client(local_broker, monkeypatch):
+    monkeypatch.setattr(settings, "event_buffer_size", 2)
+
+    async def run():
+        response = await api.stream_events(FakeRequest(), job_ids=None, status=None)
+        for job_id in range(3):
+            local_broker.publish("fire", job_id)
+        await asyncio.sleep(0)
+
+        with pytest.raises(StopAsyncIteration):
+            await response.body_iterator.__anext__()
+        assert not local_broker._subscribers
+
+    asyncio.run(run())
@@ -0,0 +1,190 @@
+"""
+Unit tests for the schedule forecast
+"""
+from datetime import datetime, timedelta
+from zoneinfo import ZoneInfo
+import time
+import numpy as np
+import pytest
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+from src.api import api
+from src.core import forecast
+from src.core import scheduler as scheduler_module
+from src.core.events import EventBroker
+from src.core.forecast import (
+    first_fire_offsets, next_fire_times, next_fire_times_iso, fires_histogram,
+    load_schedule, invalidate_schedule_cache, scheduler_now, _local_to_scheduler_offset
+)
+from src.core.scheduler import SimpleScheduler
+from src.core.settings import settings
+from src.models.models import Base, Job
+
+NOW = np.datetime64('2026-10-19T10:00:00', 's')
+
+
+def brute_force_histogram(next_run, interval_seconds, now, horizon_seconds, bucket_seconds):
+    """Count fires one at a time"""
+    counts = np.zeros(-(-horizon_seconds // bucket_seconds), dtype=np.int64)
+    for offset, interval in zip(first_fire_offsets(next_run, interval_seconds, now), interval_seconds):
+        while offset < horizon_seconds:
+            counts[offset // bucket_seconds] += 1
+            offset += interval
+    return counts
+
+
+@pytest.mark.parametrize("horizon_seconds,bucket_seconds", [(86400, 60), (7200, 300), (10000, 900)])
+def test_histogram_matches_brute_force(horizon_seconds, bucket_seconds):
+    rng = np.random.default_rng(0)
+    jobs = 2000
+    # A few crowded intervals that take the dense path plus a long tail of rare ones
+    interval_seconds = np.where(
+        rng.random(jobs) < 0.5,
+        rng.choice([60, 300, 3600], jobs),
+        rng.integers(1, 2000, jobs) * 60
+    )
+    next_run = NOW + rng.integers(-200000, 200000, jobs).astype('timedelta64[s]')
+
+    expected = brute_force_histogram(next_run, interval_seconds, NOW, horizon_seconds, bucket_seconds)
+    result = fires_histogram(next_run, interval_seconds, NOW, horizon_seconds, bucket_seconds)
+    assert np.array_equal(result, expected)
+
+
+def test_histogram_empty():
+    empty = np.empty(0, dtype=np.int64)
+    result = fires_histogram(np.empty(0, dtype='datetime64[s]'), empty, NOW, 3600, 60)
+    assert np.array_equal(result, np.zeros(60, dtype=np.int64))
+
+
+def test_stale_next_run_rolls_forward():
+    next_run = np.array([
+        NOW - np.timedelta64(90, 's'),    # 90s stale, 60s interval -> 30s from now
+        NOW - np.timedelta64(7200, 's'),  # exactly two intervals stale -> now
+        NOW + np.timedelta64(45, 's'),    # future values are kept
+    ])
+    interval_seconds = np.array([60, 3600, 60], dtype=np.int64)
+    assert first_fire_offsets(next_run, interval_seconds, NOW).tolist() == [30, 0, 45]
+
+    times = next_fire_times(next_run, interval_seconds, NOW, 3)
+    assert times[0].tolist() == [
+        datetime(2026, 10, 19, 10, 0, 30),
+        datetime(2026, 10, 19, 10, 1, 30),
+        datetime(2026, 10, 19, 10, 2, 30),
+    ]
+    assert next_fire_times_iso(next_run, interval_seconds, NOW, 2)[1] == [
+        '2026-10-19T10:00:00', '2026-10-19T11:00:00'
+    ]
+
+
+def test_local_to_scheduler_offset(monkeypatch):
+    monkeypatch.setenv("TZ", "UTC")
+    time.tzset()
+    try:
+        assert _local_to_scheduler_offset("Asia/Kolkata") == np.timedelta64(19800, 's')
+        assert _local_to_scheduler_offset("UTC") == np.timedelta64(0, 's')
+        monkeypatch.setenv("TZ", "Asia/Kolkata")
+        time.tzset()
+        assert _local_to_scheduler_offset("Asia/Kolkata") == np.timedelta64(0, 's')
+    finally:
+        monkeypatch.undo()
+        time.tzset()
+
+
+@pytest.fixture
+def broker(monkeypatch):
+    broker = EventBroker()
+    monkeypatch.setattr(forecast, "event_broker", broker)
+    monkeypatch.setattr(forecast, "_schedule_cache", {})
+    return broker
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False},
+                           poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(scheduler_module, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def db(session_factory):
+    session = session_factory()
+    yield session
+    session.close()
+
+
+def test_load_schedule(db, broker, monkeypatch):
+    monkeypatch.setattr(forecast, "_local_to_scheduler_offset", lambda timezone: np.timedelta64(0, 's'))
+    base = datetime(2026, 10, 19, 10, 0, 0, 500000)
+    db.add_all([
+        Job(name="a", interval="5 minutes", next_run=base),
+        Job(name="b", interval="2 hours", next_run=base + timedelta(minutes=1)),
+        Job(name="c", interval="30s", next_run=base),  # unparseable, defaults to 1 hour
+        Job(name="d", interval="5 minutes", next_run=base),
+    ])
+    db.commit()
+
+    ids, next_run, interval_seconds = load_schedule(db)
+    assert ids.tolist() == [1, 2, 3, 4]
+    assert interval_seconds.tolist() == [300, 7200, 3600, 300]
+    assert next_run[1] == np.datetime64('2026-10-19T10:01:00', 's')
+
+    ids, _, interval_seconds = load_schedule(db, job_ids=[2, 4])
+    assert ids.tolist() == [2, 4]
+    assert interval_seconds.tolist() == [7200, 300]
+
+
+def test_cached_schedule_follows_job_events(db, broker, monkeypatch):
+    monkeypatch.setattr(forecast, "_local_to_scheduler_offset", lambda timezone: np.timedelta64(0, 's'))
+    base = datetime(2026, 10, 19, 10, 0)
+    db.add_all([Job(name=name, interval="1 hour", next_run=base) for name in "abc"])
+    db.commit()
+    load_schedule(db)
+
+    # Rows written behind the cache's back are not re-read per request...
+    db.add(Job(name="d", interval="daily", next_run=base))
+    db.commit()
+    assert load_schedule(db)[0].tolist() == [1, 2, 3]
+
+    # ...but create/delete/fire events from any replica patch the arrays in place
+    broker.publish("create", 4, interval="daily", next_run=base)
+    broker.publish("delete", 2)
+    broker.publish("fire", 3, next_run=str(base + timedelta(hours=1)))
+    ids, next_run, interval_seconds = load_schedule(db)
+    assert ids.tolist() == [1, 3, 4]
+    assert interval_seconds.tolist() == [3600, 3600, 86400]
+    assert next_run.tolist() == [base, base + timedelta(hours=1), base]
+
+    # A full reload goes back to the database, where job 2 was never deleted
+    invalidate_schedule_cache()
+    assert load_schedule(db)[0].tolist() == [1, 2, 3, 4]
+
+
+def test_forecast_matches_scheduler_next_run_time(db, broker, monkeypatch):
+    scheduler = SimpleScheduler()
+    monkeypatch.setattr(api, "_scheduler", scheduler)
+    monkeypatch.setattr(api, "event_broker", broker)
+    try:
+        daily = api.create_job(api.JobCreate(name="daily", interval="daily"), db)
+        hourly = api.create_job(api.JobCreate(name="hourly", interval="1 hour"), db)
+        # A resync after restart must not move existing timers either
+        scheduler.sync_jobs()
+
+        ids, next_run, interval_seconds = load_schedule(db, timezone=settings.scheduler_timezone)
+        now = scheduler_now()
+        first = next_fire_times(next_run, interval_seconds, now, 1)[:, 0]
+        for job_id, fire_time in zip(ids.tolist(), first):
+            next_run_time = scheduler.scheduler.get_job(str(job_id)).next_run_time
+            expected = next_run_time.astimezone(ZoneInfo(settings.scheduler_timezone)).replace(tzinfo=None)
+            assert fire_time == np.datetime64(expected, 's')
+
+        # The daily job does not fire within the next 23 hours
+        counts = fires_histogram(next_run[ids == daily.id], interval_seconds[ids == daily.id], now,
+                                 23 * 3600, 3600)
+        assert counts.sum() == 0
+        assert hourly.id in ids
+    finally:
+        scheduler.shutdown()
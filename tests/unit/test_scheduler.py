@@ -0,0 +1,172 @@
+"""
+Unit tests for the scheduler process, its command channel and sync
+"""
+from datetime import datetime
+import json
+import threading
+import pytest
+from pydantic import ValidationError
+from sqlalchemy import create_engine
+from sqlalchemy.orm import sessionmaker
+from src.core import scheduler as scheduler_module
+from src.core.scheduler import SimpleScheduler, RemoteScheduler, process_commands
+from src.core.settings import Settings
+from src.models.models import Base, Job
+
+
+class ListRedis:
+    """Redis stand-in that records list pushes"""
+    def __init__(self):
+        self.pushed = []
+
+    def lpush(self, key, value):
+        self.pushed.append((key, value))
+
+
+class DownRedis:
+    """Redis stand-in whose connection always fails"""
+    def lpush(self, key, value):
+        raise ConnectionError("Connection refused")
+
+
+class ScriptedRedis:
+    """Redis stand-in whose brpop replays a script, then stops the loop"""
+    def __init__(self, script, stop):
+        self.script = list(script)
+        self.stop = stop
+
+    def brpop(self, key, timeout=0):
+        if not self.script:
+            self.stop.set()
+            return None
+        step = self.script.pop(0)
+        if isinstance(step, Exception):
+            raise step
+        return step
+
+
+class ImmediateStop(threading.Event):
+    """Stop event whose backoff waits return immediately"""
+    def __init__(self):
+        super().__init__()
+        self.waits = []
+
+    def wait(self, timeout=None):
+        self.waits.append(timeout)
+        return self.is_set()
+
+
+@pytest.fixture
+def session_factory(monkeypatch):
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(engine)
+    factory = sessionmaker(bind=engine)
+    monkeypatch.setattr(scheduler_module, "SessionLocal", factory)
+    return factory
+
+
+@pytest.fixture
+def scheduler(session_factory):
+    scheduler = SimpleScheduler()
+    yield scheduler
+    scheduler.shutdown()
+
+
+def add_jobs(factory, *jobs):
+    with factory() as db:
+        db.add_all(Job(name=name, interval=interval, next_run=datetime.now()) for name, interval in jobs)
+        db.commit()
+
+
+def command(**fields):
+    return ("jobs:scheduler:commands", json.dumps(fields))
+
+
+def test_remote_scheduler_encodes_commands():
+    redis = ListRedis()
+    remote = RemoteScheduler(redis, queue="commands")
+    remote.schedule_job(3, "backup", "5 minutes")
+    remote.remove_job(3)
+
+    assert [key for key, _ in redis.pushed] == ["commands", "commands"]
+    assert [json.loads(value) for _, value in redis.pushed] == [
+        {"action": "schedule", "job_id": 3, "name": "backup", "interval": "5 minutes"},
+        {"action": "remove", "job_id": 3},
+    ]
+
+
+def test_process_commands_applies_schedule_and_remove(scheduler):
+    stop = ImmediateStop()
+    redis = ScriptedRedis([
+        command(action="schedule", job_id=1, name="a", interval="5 minutes"),
+        command(action="schedule", job_id=2, name="b", interval="1 hour"),
+        ("jobs:scheduler:commands", "not json"),
+        command(action="unknown", job_id=2),
+        command(action="remove", job_id=1),
+    ], stop)
+    process_commands(scheduler, redis, stop)
+
+    jobs = {job.id: job for job in scheduler.scheduler.get_jobs()}
+    assert list(jobs) == ["2"]
+    assert jobs["2"].trigger.interval.total_seconds() == 3600
+
+
+def test_outage_resyncs_once_without_resetting_timers(scheduler, session_factory, monkeypatch):
+    add_jobs(session_factory, ("daily", "daily"), ("hourly", "1 hour"))
+    scheduler.sync_jobs()
+    before = {job.id: job.next_run_time for job in scheduler.scheduler.get_jobs()}
+
+    syncs = []
+    sync_jobs = scheduler.sync_jobs
+    monkeypatch.setattr(scheduler, "sync_jobs", lambda: syncs.append(1) or sync_jobs())
+
+    stop = ImmediateStop()
+    outage = [ConnectionError("Connection refused")] * 4
+    redis = ScriptedRedis(outage + [None, None], stop)
+    process_commands(scheduler, redis, stop)
+
+    # Exponential backoff while down, one resync once brpop answers again
+    assert stop.waits == [1, 2, 4, 8]
+    assert len(syncs) == 1
+    assert {job.id: job.next_run_time for job in scheduler.scheduler.get_jobs()} == before
+
+
+def test_lost_command_is_applied_by_periodic_sync(scheduler, session_factory):
+    add_jobs(session_factory, ("backup", "1 hour"))
+    # The API committed the row but could not reach Redis
+    RemoteScheduler(DownRedis()).schedule_job(1, "backup", "1 hour")
+    assert scheduler.scheduler.get_jobs() == []
+
+    stop = ImmediateStop()
+    process_commands(scheduler, ScriptedRedis([None], stop), stop, sync_seconds=0)
+
+    jobs = scheduler.scheduler.get_jobs()
+    assert [job.id for job in jobs] == ["1"]
+    assert jobs[0].trigger.interval.total_seconds() == 3600
+
+
+def test_sync_jobs_only_touches_changed_jobs(scheduler, session_factory):
+    add_jobs(session_factory, ("a", "daily"), ("b", "1 hour"), ("c", "5 minutes"))
+    scheduler.sync_jobs()
+    before = {job.id: job.next_run_time for job in scheduler.scheduler.get_jobs()}
+
+    add_jobs(session_factory, ("d", "weekly"))
+    with session_factory() as db:
+        db.query(Job).filter(Job.id == 2).update({"interval": "2 hours"})
+        db.query(Job).filter(Job.id == 3).delete()
+        db.commit()
+    assert scheduler.sync_jobs() == 3
+
+    jobs = {job.id: job for job in scheduler.scheduler.get_jobs()}
+    assert sorted(jobs) == ["1", "2", "4"]
+    assert jobs["1"].next_run_time == before["1"]
+    assert jobs["2"].trigger.interval.total_seconds() == 7200
+    assert jobs["4"].trigger.interval.total_seconds() == 7 * 86400
+
+
+def test_scheduler_mode_rejects_unknown_values():
+    assert Settings(scheduler_mode="api").scheduler_mode == "api"
+    with pytest.raises(ValidationError):
+        Settings(scheduler_mode="API")
+    with pytest.raises(ValidationError):
+        Settings(scheduler_mode="remote")